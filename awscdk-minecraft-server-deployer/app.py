@@ -16,6 +16,7 @@ MINECRAFT_SERVER_BACKUPS_BUCKET_NAME = os.environ["MINECRAFT_SERVER_BACKUPS_BUCK
 SSH_KEY_PAIR_NAME = os.environ.get("SSH_KEY_PAIR_NAME", None)
 CUSTOM_TOP_LEVEL_DOMAIN_NAME = os.environ.get("CUSTOM_TOP_LEVEL_DOMAIN_NAME", None)
 EC2_INSTANCE_TYPE = os.environ.get("EC2_INSTANCE_TYPE", None)
+EC2_MACHINE_IMAGE_ID = os.environ.get("EC2_MACHINE_IMAGE_ID", None)
 
 print(f"[{datetime.now()}] Running app.py for Account {AWS_ACCOUNT_ID}, Region {AWS_REGION}")
 
@@ -33,6 +34,7 @@ ServerStack(
     ssh_key_pair_name=SSH_KEY_PAIR_NAME,
     custom_top_level_domain_name=CUSTOM_TOP_LEVEL_DOMAIN_NAME,
     ec2_instance_type=EC2_INSTANCE_TYPE,
+    ec2_machine_image_id=EC2_MACHINE_IMAGE_ID,
     env=CDK_ENV,
 )
 
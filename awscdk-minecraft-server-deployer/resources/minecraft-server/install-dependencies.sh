@@ -0,0 +1,28 @@
+#!/bin/bash
+
+# Installs the CLI tools needed by setup.sh.
+#
+# When the EC2 instance is launched from a stock Amazon Linux AMI, setup.sh runs this script
+# on every boot. To skip it, bake these tools into a custom AMI (e.g. run this script in an
+# EC2 Image Builder component or a Packer shell provisioner) and pass that AMI's ID to the
+# deployer as EC2_MACHINE_IMAGE_ID.
+#
+# The user data also runs three tools before this script ever runs, so a custom AMI must provide
+# those too: ``aws`` (to download the server files from S3), ``unzip`` (to extract them) and
+# ``/opt/aws/bin/cfn-signal`` from aws-cfn-bootstrap (to report the result to CloudFormation).
+# Stock Amazon Linux ships all three; this script installs them too, for AMIs baked from
+# another base image.
+
+yum update -y
+yum install -y docker
+
+# install docker-compose and make the binary executable
+curl -L https://github.com/docker/compose/releases/latest/download/docker-compose-$(uname -s)-$(uname -m) -o /usr/bin/docker-compose
+chmod +x /usr/bin/docker-compose
+
+# install aws cli
+yum install -y python3
+pip3 install awscli --upgrade --user
+
+# install the tools the user data runs before setup.sh
+yum install -y unzip aws-cfn-bootstrap
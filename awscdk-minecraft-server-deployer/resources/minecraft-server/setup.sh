@@ -0,0 +1,64 @@
+#!/bin/bash
+
+# Starts the minecraft server on the EC2 instance.
+#
+# The EC2 user data downloads this directory from S3, unzips it into the working directory,
+# and runs this script with the following environment variables set:
+#
+# - MINECRAFT_SERVER_SEMANTIC_VERSION
+# - BACKUP_SERVICE_DOCKER_IMAGE_URI
+# - MINECRAFT_SERVER_BACKUPS_BUCKET_NAME
+# - BACKUP_INTERVAL_SECONDS
+# - RESTORE_FROM_MOST_RECENT_BACKUP ("true" or "false")
+# - INSTALL_DEPENDENCIES ("true" or "false")
+# - AWS_ACCOUNT_ID
+# - AWS_REGION
+#
+# The user data wraps this script with an EXIT trap that sends a cfn-signal carrying the
+# exit code of this script, so CloudFormation waits for the server to be started.
+
+# make the logged output of this script available in the EC2 console
+exec > >(tee /var/log/user-data.log|logger -t user-data -s 2>/dev/console) 2>&1
+
+# print the commands this script runs as they are executed
+set -x
+
+WORKDIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+cd "$WORKDIR"
+
+#########################################
+# --- Install CLI tool dependencies --- #
+#########################################
+
+if [ "$INSTALL_DEPENDENCIES" = "true" ]; then
+    bash "$WORKDIR/install-dependencies.sh"
+fi
+
+# initialize docker and docker-swarm daemons
+service docker start
+docker swarm init
+
+# login to ECR and pull the minecraft server backup/restore image
+aws ecr get-login-password --region "$AWS_REGION" | docker login --username AWS --password-stdin "$AWS_ACCOUNT_ID.dkr.ecr.$AWS_REGION.amazonaws.com"
+docker pull "$BACKUP_SERVICE_DOCKER_IMAGE_URI"
+
+# docker-compose reads the variables referenced in docker-compose.yml from this file
+cat << EOF > "$WORKDIR/.env"
+MINECRAFT_SERVER_SEMANTIC_VERSION=$MINECRAFT_SERVER_SEMANTIC_VERSION
+BACKUP_SERVICE_DOCKER_IMAGE_URI=$BACKUP_SERVICE_DOCKER_IMAGE_URI
+MINECRAFT_SERVER_BACKUPS_BUCKET_NAME=$MINECRAFT_SERVER_BACKUPS_BUCKET_NAME
+BACKUP_INTERVAL_SECONDS=$BACKUP_INTERVAL_SECONDS
+EOF
+
+# restore from backup if $RESTORE_FROM_MOST_RECENT_BACKUP is set to "true"
+if [ "$RESTORE_FROM_MOST_RECENT_BACKUP" = "true" ]; then
+    docker-compose run minecraft-backup restore || echo "Failed to restore from backup. Starting fresh..."
+fi
+
+##########################################
+# --- Start up the with docker swarm --- #
+##########################################
+
+# create a docker stack
+# docker network create minecraft-server
+docker-compose up -d
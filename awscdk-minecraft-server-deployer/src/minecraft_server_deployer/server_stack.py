@@ -1,8 +1,9 @@
 """Boilerplate stack to make sure the CDK is set up correctly."""
 
+import shlex
+import weakref
 from pathlib import Path
-from string import Template
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import aws_cdk as cdk
 from aws_cdk import Stack
@@ -12,10 +13,18 @@ from aws_cdk import aws_ecr as ecr
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_route53 as route53
 from aws_cdk import aws_s3 as s3
+from aws_cdk import aws_s3_assets as s3_assets
 from constructs import Construct
 
 THIS_DIR = Path(__file__).parent
-USER_DATA_SH_TEMPLATE_FPATH = (THIS_DIR / "../../resources/user-data.template.sh").resolve()
+MINECRAFT_SERVER_FILES_DIR = (THIS_DIR / "../../resources/minecraft-server").resolve()
+MINECRAFT_SERVER_WORKDIR = "/minecraft"
+
+# default VPCs already looked up, per app and then per (account, region); keyed weakly on the
+# app so that the lookups are dropped with it instead of leaking into the next App
+_VPC_CACHE: "weakref.WeakKeyDictionary[Construct, Dict[Tuple[str, str], ec2.IVpc]]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class ServerStack(Stack):
@@ -28,6 +37,12 @@ class ServerStack(Stack):
     :param backup_service_docker_image_uri: The URI of the Docker image in ECR for the backup service.
     :param minecraft_server_backups_bucket_name: The name of the S3 bucket to store backups in.
     :param ssh_key_pair_name: The name of the SSH key pair to use for the EC2 instance.
+    :param ec2_machine_image_id: Optionally, the ID of an AMI in this stack's region that already has the
+        tools in ``resources/minecraft-server/install-dependencies.sh`` installed. If set, the instance is launched from it
+        and the user data skips installing them on boot. Otherwise the latest Amazon Linux AMI is used.
+        The AMI must also provide what the user data runs before that script: the ``aws`` CLI (for the S3 download
+        of the server files), ``unzip``, and ``/opt/aws/bin/cfn-signal`` from the ``aws-cfn-bootstrap`` package.
+        Stock Amazon Linux includes all three.
     """
 
     def __init__(
@@ -41,11 +56,12 @@ class ServerStack(Stack):
         ssh_key_pair_name: Optional[str] = None,
         custom_top_level_domain_name: Optional[str] = None,
         ec2_instance_type: Optional[str] = "t2.medium",
+        ec2_machine_image_id: Optional[str] = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
-        _vpc = ec2.Vpc.from_lookup(scope=self, id="DefaultVpc", is_default=True)
+        _vpc = get_default_vpc(scope=self)
 
         # set up security group to allow inbound traffic on port 25565 for anyone
         _sg = ec2.SecurityGroup(
@@ -81,9 +97,16 @@ class ServerStack(Stack):
             iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSSMManagedInstanceCore")
         )
 
-        # fill in user data script
-        _user_data_script = ec2.UserData.custom(
-            render_user_data_script(
+        # the setup script and docker-compose.yml are uploaded as an asset; the user data only
+        # downloads and runs them, so it is small and changes only when the asset hash does
+        _server_files = s3_assets.Asset(
+            scope=self,
+            id="MinecraftServerFiles",
+            path=str(MINECRAFT_SERVER_FILES_DIR),
+        )
+        _user_data_script = make_user_data_script(
+            server_files=_server_files,
+            environment=render_setup_script_environment(
                 minecraft_semantic_version=minecraft_server_version,
                 backup_service_docker_image_uri=backup_service_docker_image_uri,
                 minecraft_server_backups_bucket_name=minecraft_server_backups_bucket_name,
@@ -91,7 +114,8 @@ class ServerStack(Stack):
                 restore_from_most_recent_backup=True,
                 aws_account_id=self.account,
                 aws_region=self.region,
-            )
+                install_dependencies=not ec2_machine_image_id,
+            ),
         )
 
         _ec2 = ec2.Instance(
@@ -99,13 +123,20 @@ class ServerStack(Stack):
             id="MinecraftServerInstance",
             vpc=_vpc,
             instance_type=ec2.InstanceType(ec2_instance_type),
-            machine_image=ec2.MachineImage.latest_amazon_linux(),
+            machine_image=(
+                ec2.MachineImage.generic_linux({self.region: ec2_machine_image_id})
+                if ec2_machine_image_id
+                else ec2.MachineImage.latest_amazon_linux()
+            ),
             user_data=_user_data_script,
             user_data_causes_replacement=True,
             role=_iam_role,
             security_group=_sg,
             key_name=ssh_key_pair_name,
         )
+        wait_for_user_data_to_finish(instance=_ec2, user_data=_user_data_script)
+        _server_files.grant_read(_ec2.role)
+
         grant_ecr_pull_access(
             ecr_repo_arn=backup_service_ecr_repo_arn, role=_ec2.role, repo_construct_id="BackupServiceEcrRepo"
         )
@@ -140,13 +171,47 @@ class ServerStack(Stack):
         add_alarms_to_stack(scope=self, ec2_instance_id=_ec2.instance_id)
 
 
+def get_default_vpc(scope: Construct) -> ec2.IVpc:
+    """Look up the default VPC, reusing a previous lookup in the same app for the same account and region.
+
+    :param scope: A construct inside the stack whose account/region the lookup is for.
+    """
+    stack = Stack.of(scope)
+    app_vpcs: Dict[Tuple[str, str], ec2.IVpc] = _VPC_CACHE.setdefault(stack.node.root, {})
+    cache_key = (stack.account, stack.region)
+    if cache_key not in app_vpcs:
+        app_vpcs[cache_key] = ec2.Vpc.from_lookup(scope=scope, id="DefaultVpc", is_default=True)
+    return app_vpcs[cache_key]
+
+
+def wait_for_user_data_to_finish(
+    instance: ec2.Instance,
+    user_data: ec2.UserData,
+    timeout_minutes: int = 15,
+) -> None:
+    """Make CloudFormation wait for the user data script to signal that it has finished.
+
+    The user data script sends ``cfn-signal`` with its exit code when it exits, so
+    ``cdk deploy`` only completes once the minecraft server has been started (or fails
+    if the script did), rather than the caller having to poll the instance.
+
+    :param instance: The EC2 instance running the user data script.
+    :param user_data: The user data script of ``instance``.
+    :param timeout_minutes: How long CloudFormation waits for the signal before failing the deployment.
+    """
+    user_data.add_signal_on_exit_command(instance)
+    instance.instance.cfn_options.creation_policy = cdk.CfnCreationPolicy(
+        resource_signal=cdk.CfnResourceSignal(count=1, timeout=f"PT{timeout_minutes}M"),
+    )
+
+
 def grant_ecr_pull_access(ecr_repo_arn: str, role: iam.Role, repo_construct_id: str):
     """Grant the given role access to pull docker images from the given ECR repo."""
     ecr_repo = ecr.Repository.from_repository_arn(scope=role, id=repo_construct_id, repository_arn=ecr_repo_arn)
     ecr_repo.grant_pull(role)
 
 
-def render_user_data_script(
+def render_setup_script_environment(
     minecraft_semantic_version: str,
     backup_service_docker_image_uri: str,
     minecraft_server_backups_bucket_name: str,
@@ -154,23 +219,47 @@ def render_user_data_script(
     aws_region: str,
     restore_from_most_recent_backup: bool = True,
     backup_interval_seconds: int = 60 * 10,
-) -> str:
-    """Render the user data script for the EC2 instance.
+    install_dependencies: bool = True,
+) -> Dict[str, str]:
+    """Render the environment variables that ``resources/minecraft-server/setup.sh`` expects.
 
     :param minecraft_semantic_version: The semantic version of the Minecraft server to install.
     :param backup_service_docker_image_uri: The URI of the Docker image in ECR for the backup service.
+    :param install_dependencies: Whether to install docker, docker-compose and the AWS CLI on boot.
+        Set this to ``False`` if the AMI already has them installed.
     """
-    return Template(USER_DATA_SH_TEMPLATE_FPATH.read_text()).substitute(
-        {
-            "MINECRAFT_SERVER_SEMANTIC_VERSION": minecraft_semantic_version,
-            "BACKUP_SERVICE_DOCKER_IMAGE_URI": backup_service_docker_image_uri,
-            "RESTORE_FROM_MOST_RECENT_BACKUP": str(restore_from_most_recent_backup).lower(),
-            "MINECRAFT_SERVER_BACKUPS_BUCKET_NAME": minecraft_server_backups_bucket_name,
-            "AWS_ACCOUNT_ID": aws_account_id,
-            "AWS_REGION": aws_region,
-            "BACKUP_INTERVAL_SECONDS": str(backup_interval_seconds),
-        }
+    return {
+        "MINECRAFT_SERVER_SEMANTIC_VERSION": minecraft_semantic_version,
+        "BACKUP_SERVICE_DOCKER_IMAGE_URI": backup_service_docker_image_uri,
+        "RESTORE_FROM_MOST_RECENT_BACKUP": str(restore_from_most_recent_backup).lower(),
+        "MINECRAFT_SERVER_BACKUPS_BUCKET_NAME": minecraft_server_backups_bucket_name,
+        "AWS_ACCOUNT_ID": aws_account_id,
+        "AWS_REGION": aws_region,
+        "BACKUP_INTERVAL_SECONDS": str(backup_interval_seconds),
+        "INSTALL_DEPENDENCIES": str(install_dependencies).lower(),
+    }
+
+
+def make_user_data_script(server_files: s3_assets.Asset, environment: Dict[str, str]) -> ec2.UserData:
+    """Make a user data script that downloads the server files from S3 and runs ``setup.sh``.
+
+    :param server_files: The asset containing the contents of ``resources/minecraft-server/``.
+    :param environment: Environment variables to export before running ``setup.sh``.
+    """
+    user_data = ec2.UserData.for_linux()
+    user_data.add_commands(*[f"export {name}={shlex.quote(value)}" for name, value in environment.items()])
+
+    server_files_zip_fpath: str = user_data.add_s3_download_command(
+        bucket=server_files.bucket,
+        bucket_key=server_files.s3_object_key,
     )
+    user_data.add_commands(
+        f"mkdir -p {MINECRAFT_SERVER_WORKDIR}",
+        f"unzip -o {server_files_zip_fpath} -d {MINECRAFT_SERVER_WORKDIR}",
+    )
+    user_data.add_execute_file_command(file_path=f"{MINECRAFT_SERVER_WORKDIR}/setup.sh")
+
+    return user_data
 
 
 def grant_s3_read_write_access(bucket_name: str, role: iam.Role, bucket_construct_id: str):
@@ -297,15 +386,3 @@ def add_custom_subdomain_to_ec2_ip(
         target=route53.RecordTarget.from_ip_addresses(instance.instance_public_ip),
         record_name=f"server.minecraft-paas.{hosted_zone.zone_name}",
     )
-
-if __name__ == "__main__":
-    print(
-        render_user_data_script(
-            minecraft_semantic_version="1.16.5",
-            backup_service_docker_image_uri="some-image-uri",
-            minecraft_server_backups_bucket_name="some-bucket-name",
-            restore_from_most_recent_backup=True,
-            aws_account_id="some-aws-account-id",
-            aws_region="some-aws-region",
-        )
-    )
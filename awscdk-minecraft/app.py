@@ -1,21 +1,31 @@
 # -*- coding: utf-8 -*-
 import os
 
-from aws_cdk import App, Environment
-from cdk_minecraft import MinecraftPaasStack
+# the jsii node process inherits this environment when ``aws_cdk`` is first imported,
+# so it must be set before the import; capturing a stack trace for every construct
+# dominates synth time
+os.environ.setdefault("CDK_DISABLE_STACK_TRACE", "1")
+
+from aws_cdk import App, Environment  # noqa: E402
+from cdk_minecraft import MinecraftPaasStack  # noqa: E402
 
 # for development, use account/region from cdk cli
 DEV_ENV = Environment(account=os.environ["AWS_ACCOUNT_ID"], region=os.getenv("AWS_REGION"))
 
-APP = App()
+DISABLE_FRONTEND = True
+DISABLE_AUTH = True
+
+APP = App(context={"aws:cdk:disable-stack-trace": "true"})
 
 MinecraftPaasStack(
     APP,
     "awscdk-minecraft-pickupgames-mc",
     login_page_domain_name_prefix="pickupgames-mc-user-pool",
     ec2_instance_type="t3.medium",
-    disable_frontend=True,
-    disable_auth=True,
+    disable_frontend=DISABLE_FRONTEND,
+    disable_auth=DISABLE_AUTH,
+    # a stack without the frontend or auth is only used for development, so don't leave its data behind
+    dev_mode=DISABLE_FRONTEND or DISABLE_AUTH,
     env=DEV_ENV,
 )
 
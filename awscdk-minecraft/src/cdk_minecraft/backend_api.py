@@ -8,11 +8,10 @@ from aws_cdk import CfnOutput
 from aws_cdk import aws_apigateway as apigw
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as lambda_
-from cdk_minecraft.constants import MINECRAFT_PLATFORM_BACKEND_API__DIR
+from cdk_minecraft.constants import MINECRAFT_PLATFORM_BACKEND_API__DIR, SERVER_CLOUD_FORMATION_STACK_NAME
 from constructs import Construct
 
 REACT_LOCALHOST = "http://localhost:3000"
-SERVER_CLOUD_FORMATION_STACK_NAME = "awscdk-minecraft-server"
 
 
 class MinecraftPaaSRestApi(Construct):
@@ -41,13 +40,16 @@ class MinecraftPaaSRestApi(Construct):
             frontend_cors_url=frontend_cors_url,
         )
 
+        #: alias with provisioned concurrency so that requests are served by initialized containers
+        live_alias: lambda_.Alias = make_warm_alias(function=fast_api_function)
+
         api = apigw.RestApi(self, f"{construct_id}RestApi")
         proxy: apigw.Resource = api.root.add_resource(path_part="{proxy+}")
 
         proxy.add_method(
             http_method="ANY",
             integration=apigw.LambdaIntegration(
-                handler=fast_api_function,
+                handler=live_alias,
                 proxy=True,
             ),
             authorizer=authorizer,
@@ -55,12 +57,31 @@ class MinecraftPaaSRestApi(Construct):
 
         add_cors_options_method(resource=proxy, frontend_cors_url=frontend_cors_url)
 
+        self.handler: lambda_.Function = fast_api_function
+        self.handler_alias: lambda_.Alias = live_alias
         self.role: iam.Role = fast_api_function.role
         self.url: str = api.url
 
         CfnOutput(self, "EndpointURL", value=api.url)
 
 
+def make_warm_alias(
+    function: lambda_.Function,
+    provisioned_concurrent_executions: int = 2,
+) -> lambda_.Alias:
+    """
+    Create a ``live`` alias of the function that avoids cold starts.
+
+    The alias keeps ``provisioned_concurrent_executions`` containers initialized. Requests beyond
+    that concurrency still spill over to on-demand containers, which start cold. The alias is
+    repointed at each new version rather than replaced, so deploys do not tear down its provisioned concurrency.
+    """
+    return function.add_alias(
+        "live",
+        provisioned_concurrent_executions=provisioned_concurrent_executions,
+    )
+
+
 def add_cors_options_method(
     resource: apigw.Resource,
     frontend_cors_url: str,
@@ -184,7 +205,8 @@ def make_fast_api_function(
         scope,
         id=f"{id_prefix}MinecraftPaaSRestApiLambda",
         timeout=cdk.Duration.seconds(30),
-        memory_size=512,
+        # lambda allocates CPU proportionally to memory; importing FastAPI, pydantic and boto3 at startup is CPU-bound
+        memory_size=1024,
         runtime=lambda_.Runtime.PYTHON_3_8,
         handler="index.handler",
         code=lambda_.Code.from_asset(
@@ -9,3 +9,6 @@ AWSCDK_MINECRAFT_SERVER_DEPLOYER__DIR = RESOURCES_DIR / "awscdk-minecraft-server
 MINECRAFT_PLATFORM_BACKEND_API__DIR = RESOURCES_DIR / "minecraft-platform-backend-api"
 MINECRAFT_PLATFORM_FRONTEND_STATIC_WEBSITE__DIR = RESOURCES_DIR / "minecraft-platform-frontend-static"
 MINECRAFT_PLATFORM_BACKUP_SERVICE__DIR = RESOURCES_DIR / "minecraft-platform-backup-service"
+
+# name of the CloudFormation stack created by the awscdk-minecraft-server-deployer app
+SERVER_CLOUD_FORMATION_STACK_NAME = "awscdk-minecraft-server"
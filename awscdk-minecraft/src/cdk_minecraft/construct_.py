@@ -1,22 +1,21 @@
 """Boilerplate stack to make sure the CDK is set up correctly."""
 
 
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import aws_cdk as cdk
-# coginto imports, user pool and client
-# coginto imports, user pool and client
 # imports for lambda functions and API Gateway
 from aws_cdk import CfnOutput, Duration, Stack
 from aws_cdk import aws_apigateway as apigw
-from aws_cdk import aws_batch_alpha as batch_alpha
+from aws_cdk import aws_batch as batch
 from aws_cdk import aws_certificatemanager as acm
 from aws_cdk import aws_cognito as cognito
 from aws_cdk import aws_iam as iam
+from aws_cdk import aws_logs as logs
 from aws_cdk import aws_route53 as route53
 from aws_cdk import aws_s3 as s3
-from aws_prototyping_sdk.static_website import StaticWebsite
-from cdk_minecraft.backend_api import MinecraftPaaSRestApi
+from cdk_minecraft.backend_api import MinecraftPaaSRestApi, make_warm_alias
 from cdk_minecraft.deploy_server_batch_job.deprovision_state_machine import (
     DeprovisionMinecraftServerStateMachine,
 )
@@ -25,12 +24,27 @@ from cdk_minecraft.deploy_server_batch_job.job_definition import (
 )
 from cdk_minecraft.deploy_server_batch_job.job_queue import BatchJobQueue
 from cdk_minecraft.deploy_server_batch_job.provision_state_machine import ProvisionMinecraftServerStateMachine
-from cdk_minecraft.frontend import (
-    create_config_json_file_in_static_site_s3_bucket,
-    make_minecraft_platform_frontend_static_website,
-)
+from cdk_minecraft.jwt_authorizer.jwt_authorizer_lambda import make_jwt_authorizer_lambda
 from constructs import Construct
 
+# The static website construct and the frontend module are imported only where they are used so that
+# stacks with the frontend disabled do not load the aws_prototyping_sdk package during synth.
+if TYPE_CHECKING:
+    from aws_prototyping_sdk.static_website import StaticWebsite
+
+#: how long API Gateway caches the authorizer's decision for a given token
+AUTHORIZER_RESULTS_CACHE_TTL = Duration.minutes(5)
+
+#: how long the ID tokens issued to the web client are valid
+ID_TOKEN_VALIDITY = Duration.hours(1)
+
+#: how long before an ID token expires clients should refresh it, to allow for clock skew
+CLIENT_TOKEN_REFRESH_MARGIN = Duration.seconds(30)
+
+#: clients should reuse an ID token for this long, i.e. refresh it shortly before Cognito's validity runs out;
+#: reusing the same token also lets API Gateway answer from the authorizer results cache
+CLIENT_TOKEN_CACHE_TTL_SECONDS = int(ID_TOKEN_VALIDITY.to_seconds() - CLIENT_TOKEN_REFRESH_MARGIN.to_seconds())
+
 
 class MinecraftPaas(Construct):
     """Class to create a stack for the Minecraft PaaS.
@@ -57,10 +71,16 @@ class MinecraftPaas(Construct):
         minecraft-paas.<top_level_custom_domain_name> -> Static Website
         server.minecraft-paas.<top_level_custom_domain_name> -> EC2 Instance
         api.minecraft-paas.<top_level_custom_domain_name> -> API Gateway
+    :param top_level_hosted_zone_id: Optionally pass the ID of the Route53 hosted zone for \
+        ``top_level_custom_domain_name`` so that it does not have to be looked up during synth.
     :param ec2_instance_type: e.g. `t2.medium`
+    :param ec2_machine_image_id: Optionally pass the ID of an AMI with docker, docker-compose and the AWS CLI \
+        pre-installed to launch the server from, so that the server does not install them on every boot.
+    :param dev_mode: Delete the buckets (and their contents) and the user pool when the stack is destroyed \
+        instead of retaining them. Only use this for stacks whose data is disposable.
 
     :ivar job_queue: The job queue for the batch jobs
-    :ivar minecraft_server_deployer_job_definition: The job definition for the batch jobs
+    :ivar minecraft_server_deployer_job_definition: The job definition for the batch job that deploys the server
     :ivar mc_deployment_state_machine: The state machine to deploy a Minecraft server
     :ivar mc_destruction_state_machine: The state machine to destroy a Minecraft server
     :ivar frontend_static_site: The static website for the frontend
@@ -77,35 +97,60 @@ class MinecraftPaas(Construct):
         minecraft_data_bucket_name: Optional[str] = None,
         ssh_key_pair_name: Optional[str] = None,
         top_level_custom_domain_name: Optional[str] = None,
+        top_level_hosted_zone_id: Optional[str] = None,
         minecraft_server_version: Optional[str] = None,
         ec2_instance_type: Optional[str] = None,
+        ec2_machine_image_id: Optional[str] = None,
         disable_frontend: bool = False,
         disable_auth: bool = False,
+        dev_mode: bool = False,
     ) -> None:
         super().__init__(scope, construct_id)
 
+        # IDs derived from this construct's ID, built once up front
+        ids = SimpleNamespace(
+            provision=f"{construct_id}ProvisionMcStateMachine",
+            deprovision=f"{construct_id}DeprovisionMcStateMachine",
+            hosted_zone=f"{construct_id}HostedZone",
+            tls=f"{construct_id}TlsCert",
+        )
+
         """Backups"""
         backups_bucket: Optional[s3.Bucket] = None
         if minecraft_data_bucket_name:
-            backups_bucket = s3.Bucket.from_bucket_name(
+            # the bucket is expected to live in this stack's account and region; saying so
+            # explicitly keeps the imported bucket from having an unknown region
+            stack = Stack.of(self)
+            backups_bucket = s3.Bucket.from_bucket_attributes(
                 scope=self,
                 id="MinecraftServerBackupsBucket",
                 bucket_name=minecraft_data_bucket_name,
+                region=stack.region,
+                account=stack.account,
             )
         else:
             backups_bucket = s3.Bucket(
                 scope=self,
                 id="MinecraftServerBackupsBucket",
-                removal_policy=cdk.RemovalPolicy.RETAIN,
+                removal_policy=cdk.RemovalPolicy.DESTROY if dev_mode else cdk.RemovalPolicy.RETAIN,
+                auto_delete_objects=dev_mode,
             )
 
         """State machines"""
-        job_queue: batch_alpha.JobQueue = BatchJobQueue(
+        job_queue: batch.JobQueue = BatchJobQueue(
             scope=self,
             construct_id="CdkDockerBatchEnv",
         ).job_queue
 
-        minecraft_server_deployer_job_definition: batch_alpha.JobDefinition = (
+        # created here rather than by the job definition so that dev_mode can delete it with the stack
+        server_jobs_log_group = logs.LogGroup(
+            scope=self,
+            id="McServerJobsLogGroup",
+            retention=logs.RetentionDays.ONE_MONTH,
+            removal_policy=cdk.RemovalPolicy.DESTROY if dev_mode else cdk.RemovalPolicy.RETAIN,
+        )
+
+        minecraft_server_deployer_job_definition: batch.EcsJobDefinition = (
             make_minecraft_ec2_deployment__batch_job_definition(
                 scope=self,
                 id_prefix="McDeployJobDefinition-",
@@ -114,32 +159,46 @@ class MinecraftPaas(Construct):
                 top_level_custom_domain_name=top_level_custom_domain_name,
                 minecraft_server_version=minecraft_server_version,
                 ec2_instance_type=ec2_instance_type,
+                ec2_machine_image_id=ec2_machine_image_id,
+                log_group=server_jobs_log_group,
             )
         )
 
         mc_deployment_state_machine = ProvisionMinecraftServerStateMachine(
             scope=self,
-            construct_id=f"{construct_id}ProvisionMcStateMachine",
+            construct_id=ids.provision,
             job_queue_arn=job_queue.job_queue_arn,
             deploy_mc_server_job_definition_arn=minecraft_server_deployer_job_definition.job_definition_arn,
         )
 
         mc_destruction_state_machine = DeprovisionMinecraftServerStateMachine(
             scope=self,
-            construct_id=f"{construct_id}DeprovisionMcStateMachine",
-            job_queue_arn=job_queue.job_queue_arn,
-            destroy_mc_server_job_definition_arn=minecraft_server_deployer_job_definition.job_definition_arn,
+            construct_id=ids.deprovision,
         )
 
-        self.top_level_hosted_zone: Optional[route53.HostedZone] = None
+        self.top_level_hosted_zone: Optional[route53.IHostedZone] = None
         if top_level_custom_domain_name:
-            self.top_level_hosted_zone = route53.HostedZone.from_lookup(
-                scope=self,
-                id=self.node.id + "HostedZone",
-                domain_name=top_level_custom_domain_name,
-            )
+            if top_level_hosted_zone_id:
+                # the zone is known up front, so skip the context provider lookup
+                self.top_level_hosted_zone = route53.HostedZone.from_hosted_zone_attributes(
+                    scope=self,
+                    id=ids.hosted_zone,
+                    hosted_zone_id=top_level_hosted_zone_id,
+                    zone_name=top_level_custom_domain_name,
+                )
+            else:
+                self.top_level_hosted_zone = route53.HostedZone.from_lookup(
+                    scope=self,
+                    id=ids.hosted_zone,
+                    domain_name=top_level_custom_domain_name,
+                )
 
         if not disable_frontend:
+            from cdk_minecraft.frontend import (
+                create_config_json_file_in_static_site_s3_bucket,
+                make_minecraft_platform_frontend_static_website,
+            )
+
             self.tls_cert: Optional[acm.Certificate] = None
             if self.top_level_hosted_zone:
                 # DNS Validated cert with wildcard for all subdomains
@@ -147,7 +206,7 @@ class MinecraftPaas(Construct):
                 # *.*.minecraft-paas.<top_level_custom_domain_name>
                 self.tls_cert = acm.Certificate(
                     scope=self,
-                    id=f"{self.node.id}TlsCert",
+                    id=ids.tls,
                     validation=acm.CertificateValidation.from_dns(hosted_zone=self.top_level_hosted_zone),
                     domain_name=f"minecraft-paas.{top_level_custom_domain_name}",
                     subject_alternative_names=[f"*.minecraft-paas.{top_level_custom_domain_name}"],
@@ -159,6 +218,7 @@ class MinecraftPaas(Construct):
                 id_prefix=construct_id,
                 top_level_hosted_zone=self.top_level_hosted_zone,
                 tls_cert=self.tls_cert,
+                dev_mode=dev_mode,
             )
             frontend_url = (
                 f"https://minecraft-paas.{top_level_custom_domain_name}"
@@ -174,38 +234,49 @@ class MinecraftPaas(Construct):
                     construct_id="MinecraftCognitoService",
                     frontend_url=frontend_url,
                     cognito_domain_name=login_page_domain_name_prefix,
+                    dev_mode=dev_mode,
                 )
-                authorizer = apigw.CognitoUserPoolsAuthorizer(
+                # verifies the Cognito ID tokens in the lambda itself rather than calling Cognito;
+                # the authorizer runs before every uncached request, so it is kept warm like the API
+                authorizer = apigw.TokenAuthorizer(
                     scope=self,
-                    id="CognitoAuthorizer",
-                    cognito_user_pools=[cognito_service.user_pool],
+                    id="JwtAuthorizer",
+                    handler=make_warm_alias(
+                        function=make_jwt_authorizer_lambda(
+                            scope=self,
+                            id_prefix=construct_id,
+                            user_pool_id=cognito_service.user_pool.user_pool_id,
+                            user_pool_client_id=cognito_service.client.user_pool_client_id,
+                        )
+                    ),
+                    results_cache_ttl=AUTHORIZER_RESULTS_CACHE_TTL,
                 )
 
+        # every attribute read crosses the jsii bridge, so read the tokens the wiring below needs once
+        deploy_state_machine_arn: str = mc_deployment_state_machine.state_machine.state_machine_arn
+        destroy_state_machine_arn: str = mc_destruction_state_machine.state_machine.state_machine_arn
+
         """Backend REST API"""
         # create lambda for the rest API and attach authorizer to API Gateway
         mc_rest_api = MinecraftPaaSRestApi(
             scope=self,
             construct_id="MinecraftPaaSRestAPI",
-            provision_server_state_machine_arn=mc_deployment_state_machine.state_machine.state_machine_arn,
-            deprovision_server_state_machine_arn=mc_destruction_state_machine.state_machine.state_machine_arn,
+            provision_server_state_machine_arn=deploy_state_machine_arn,
+            deprovision_server_state_machine_arn=destroy_state_machine_arn,
             frontend_cors_url=frontend_url if (not disable_frontend) else "dummy.cors.url",
             authorizer=authorizer if (not disable_auth) else None,
         )
 
         # add role to lambda to allow it to start the state machine
-        mc_deployment_state_machine.state_machine.grant_start_execution(mc_rest_api.role)
-        mc_destruction_state_machine.state_machine.grant_start_execution(mc_rest_api.role)
+        mc_rest_api_role: iam.Role = mc_rest_api.role
+        mc_deployment_state_machine.state_machine.grant_start_execution(mc_rest_api_role)
+        mc_destruction_state_machine.state_machine.grant_start_execution(mc_rest_api_role)
 
-        # add the states:ListExecutions permission for the deployment state machine to the mc_rest_api role
+        # add the states:ListExecutions permission for both state machines to the mc_rest_api role
         grant_list_executions_to_role(
-            id_prefix=f"{self.node.id}-deploy-",
-            role=mc_rest_api.role,
-            state_machine_arn=mc_deployment_state_machine.state_machine.state_machine_arn,
-        )
-        grant_list_executions_to_role(
-            id_prefix=f"{self.node.id}-destroy-",
-            role=mc_rest_api.role,
-            state_machine_arn=mc_destruction_state_machine.state_machine.state_machine_arn,
+            id_prefix=construct_id,
+            role=mc_rest_api_role,
+            state_machine_arns=[deploy_state_machine_arn, destroy_state_machine_arn],
         )
 
         if not disable_frontend:
@@ -219,53 +290,36 @@ class MinecraftPaas(Construct):
                 cognito_user_pool_id=cognito_service.user_pool.user_pool_id,
                 static_site_bucket=frontend_static_site.website_bucket,
                 static_site_construct=frontend_static_site,
-                cognito_user_pool_region=Stack.of(cognito_service.user_pool).region,
+                cognito_user_pool_region=cognito_service.region,
                 cognito_hosted_ui_redirect_sign_in_url=frontend_url,
                 cognito_hosted_ui_redirect_sign_out_url=frontend_url,
                 cognito_hosted_ui_fqdn=cognito_service.fully_qualified_domain_name,
             )
 
+        outputs: List[Tuple[str, str]] = [
+            ("MinecraftDeployerJobDefinitionArn", minecraft_server_deployer_job_definition.job_definition_arn),
+            ("MinecraftDeployerJobQueueArn", job_queue.job_queue_arn),
+            # rarely read values share a single JSON output to keep the template small
+            (
+                "MinecraftPaaSSummary",
+                Stack.of(self).to_json_string(
+                    {
+                        "jobDefinitionName": minecraft_server_deployer_job_definition.job_definition_name,
+                        "jobQueueName": job_queue.job_queue_name,
+                        "deployStateMachineArn": deploy_state_machine_arn,
+                        "destroyStateMachineArn": destroy_state_machine_arn,
+                    }
+                ),
+            ),
+        ]
         if not disable_frontend:
-            CfnOutput(
-                scope=self,
-                id="FrontendUrl",
-                value=frontend_url,
-            )
-            CfnOutput(
-                scope=self,
-                id="FrontendStaticSiteBucketName",
-                value=frontend_static_site.website_bucket.bucket_name,
-            )
-        CfnOutput(
-            scope=self,
-            id="MinecraftDeployerJobDefinitionArn",
-            value=minecraft_server_deployer_job_definition.job_definition_arn,
-        )
-        CfnOutput(
-            scope=self,
-            id="MinecraftDeployerJobDefinitionName",
-            value=minecraft_server_deployer_job_definition.job_definition_name,
-        )
-        CfnOutput(
-            scope=self,
-            id="MinecraftDeployerJobQueueArn",
-            value=job_queue.job_queue_arn,
-        )
-        CfnOutput(
-            scope=self,
-            id="MinecraftDeployerJobQueueName",
-            value=job_queue.job_queue_name,
-        )
-        CfnOutput(
-            scope=self,
-            id="DeployStateMachineArn",
-            value=mc_deployment_state_machine.state_machine.state_machine_arn,
-        )
-        CfnOutput(
-            scope=self,
-            id="DestroyStateMachineArn",
-            value=mc_destruction_state_machine.state_machine.state_machine_arn,
-        )
+            outputs = [
+                ("FrontendUrl", frontend_url),
+                ("FrontendStaticSiteBucketName", frontend_static_site.website_bucket.bucket_name),
+            ] + outputs
+
+        for output_id, output_value in outputs:
+            CfnOutput(scope=self, id=output_id, value=output_value)
 
         # pass the endpoint of the state machine to the lambda
 
@@ -274,17 +328,30 @@ class MinecraftPaas(Construct):
         # https://docs.aws.amazon.com/cdk/api/latest/python/aws_cdk.aws_apigateway/Authorizer.html
 
 
-def grant_list_executions_to_role(id_prefix: str, role: iam.Role, state_machine_arn: str) -> None:
-    """Add the states:ListExecutions permission for the deployment state machine to the mc_rest_api role."""
+def grant_list_executions_to_role(id_prefix: str, role: iam.Role, state_machine_arns: List[str]) -> None:
+    """Add the states:ListExecutions permission for the given state machines to the mc_rest_api role.
+
+    State machine actions and execution actions are granted in separate statements, each scoped
+    to the ARNs those actions are authorized against.
+    """
+    execution_arn_patterns: List[str] = [
+        make_state_machine_executions_arn_pattern(scope=role, state_machine_arn=state_machine_arn)
+        for state_machine_arn in state_machine_arns
+    ]
+
     role.attach_inline_policy(
         iam.Policy(
             scope=role,
             id=f"{id_prefix}-ListExecutionsPolicy",
             statements=[
                 iam.PolicyStatement(
-                    actions=["states:List*", "states:Describe*", "states:Get*"],
-                    # resources=[f"{state_machine_arn}*"],
-                    resources=["*"],
+                    actions=["states:ListExecutions", "states:DescribeStateMachine"],
+                    resources=state_machine_arns,
+                    effect=iam.Effect.ALLOW,
+                ),
+                iam.PolicyStatement(
+                    actions=["states:DescribeExecution", "states:GetExecutionHistory"],
+                    resources=execution_arn_patterns,
                     effect=iam.Effect.ALLOW,
                 ),
             ],
@@ -292,6 +359,21 @@ def grant_list_executions_to_role(id_prefix: str, role: iam.Role, state_machine_
     )
 
 
+def make_state_machine_executions_arn_pattern(scope: Construct, state_machine_arn: str) -> str:
+    """Return an ARN pattern matching every execution of the given state machine.
+
+    Execution ARNs have the form ``arn:aws:states:<region>:<account>:execution:<state machine name>:<execution name>``
+    so they are not matched by a pattern built from the state machine ARN.
+    """
+    state_machine_name: str = cdk.Arn.extract_resource_name(arn=state_machine_arn, resource_type="stateMachine")
+    return Stack.of(scope).format_arn(
+        service="states",
+        resource="execution",
+        resource_name=f"{state_machine_name}:*",
+        arn_format=cdk.ArnFormat.COLON_RESOURCE_NAME,
+    )
+
+
 class MinecraftCognitoConstruct(Construct):
     """Class to create authentication for the Minecraft PaaS."""
 
@@ -301,12 +383,14 @@ class MinecraftCognitoConstruct(Construct):
         construct_id: str,
         frontend_url: str,
         cognito_domain_name: str,
+        dev_mode: bool = False,
     ) -> None:
         super().__init__(scope, construct_id)
 
         # create a user pool, do not allow users to sign up themselves.
         # https://docs.aws.amazon.com/cdk/api/latest/python/aws_cdk.aws_cognito/UserPool.html
         stack = cdk.Stack.of(self)
+        self.region: str = stack.region
 
         self.user_pool = cognito.UserPool(
             scope=scope,
@@ -327,6 +411,7 @@ class MinecraftCognitoConstruct(Construct):
                 require_uppercase=False,
                 require_symbols=False,
             ),
+            removal_policy=cdk.RemovalPolicy.DESTROY if dev_mode else cdk.RemovalPolicy.RETAIN,
         )
 
         # add a client to the user pool, handle JWT tokens
@@ -348,9 +433,11 @@ class MinecraftCognitoConstruct(Construct):
                 callback_urls=["http://localhost:3000", frontend_url],
                 logout_urls=["http://localhost:3000", frontend_url],
             ),
-            id_token_validity=Duration.days(1),
+            # short-lived ID tokens with a long-lived refresh token let clients cache and
+            # refresh tokens rather than signing in again
+            id_token_validity=ID_TOKEN_VALIDITY,
             access_token_validity=Duration.days(1),
-            refresh_token_validity=Duration.days(1),
+            refresh_token_validity=Duration.days(30),
             prevent_user_existence_errors=True,
         )
 
@@ -392,7 +479,7 @@ class MinecraftCognitoConstruct(Construct):
             cognito_domain=cognito.CognitoDomainOptions(domain_prefix=cognito_domain_name),
         )
 
-        self.fully_qualified_domain_name = f"{self.domain.domain_name}.auth.{stack.region}.amazoncognito.com"
+        self.fully_qualified_domain_name = f"{self.domain.domain_name}.auth.{self.region}.amazoncognito.com"
 
         # add a CfnOutput to get the user pool domain
         CfnOutput(
@@ -400,3 +487,9 @@ class MinecraftCognitoConstruct(Construct):
             id="MinecraftUserPoolDomain",
             value=self.domain.domain_name,
         )
+        CfnOutput(
+            scope=scope,
+            id="CognitoTokenCacheTtlSeconds",
+            value=str(CLIENT_TOKEN_CACHE_TTL_SECONDS),
+            description="How long clients should cache Cognito ID tokens before refreshing them",
+        )
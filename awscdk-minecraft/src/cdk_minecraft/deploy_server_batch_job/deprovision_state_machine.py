@@ -2,8 +2,10 @@
 from pathlib import Path
 from typing import TypedDict
 
+from aws_cdk import Duration, Stack
 from aws_cdk import aws_stepfunctions as sfn
 from aws_cdk import aws_stepfunctions_tasks as sfn_tasks
+from cdk_minecraft.constants import SERVER_CLOUD_FORMATION_STACK_NAME
 from constructs import Construct
 from typing_extensions import NotRequired
 
@@ -12,6 +14,13 @@ THIS_DIR = Path(__file__).parent
 MIN_NUMBER_OF_MINUTES_ALLOWED_FOR_SERVER_UPTIME = 30
 MAX_NUMBER_OF_MINUTES_ALLOWED_FOR_SERVER_UPTIME = 60 * 3
 
+#: how long to wait between checks on whether the server stack has finished deleting
+STACK_DELETION_POLL_INTERVAL = Duration.seconds(30)
+
+#: error raised by the Step Functions CloudFormation SDK integration for most failed calls, including
+#: throttling ("Rate exceeded") and a stack that does not exist; only the Cause tells them apart
+CLOUDFORMATION_SDK_ERROR = "CloudFormation.CloudFormationException"
+
 
 def minutes_to_seconds(minutes: int) -> int:
     """Convert minutes to seconds."""
@@ -46,20 +55,20 @@ class DeprovisionMinecraftServerStateMachine(Construct):
         self,
         scope: Construct,
         construct_id: str,
-        job_queue_arn: str,
-        destroy_mc_server_job_definition_arn: str,
         ensure_unique_id_names: bool = False,
         min_number_of_minutes_allowed_for_server_uptime: int = MIN_NUMBER_OF_MINUTES_ALLOWED_FOR_SERVER_UPTIME,
         max_number_of_minutes_allowed_for_server_uptime: int = MAX_NUMBER_OF_MINUTES_ALLOWED_FOR_SERVER_UPTIME,
+        server_stack_name: str = SERVER_CLOUD_FORMATION_STACK_NAME,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
         self.namer = lambda name: f"{construct_id}-{name}" if ensure_unique_id_names else name
         self.ensure_unique_id_names = ensure_unique_id_names
 
-        submit_cdk_destroy_batch_job: sfn_tasks.BatchSubmitJob = self.create__destroy__submit_batch_job_state(
-            state_machine_arn=destroy_mc_server_job_definition_arn,
-            job_queue_arn=job_queue_arn,
+        destroy_server_stack: sfn.IChainable = create__destroy_server_stack__states(
+            scope=self,
+            id_prefix=self.node.id if ensure_unique_id_names else "",
+            server_stack_name=server_stack_name,
         )
 
         self.min_number_of_minutes_allowed_for_server_uptime: int = (
@@ -100,7 +109,7 @@ class DeprovisionMinecraftServerStateMachine(Construct):
             sfn.Choice(self, "Is wait time in valid range?")
             .when(
                 condition=wait_time_is_in_valid_range,
-                next=wait_n_seconds_before_destroy.next(submit_cdk_destroy_batch_job),
+                next=wait_n_seconds_before_destroy.next(destroy_server_stack),
             )
             .otherwise(failure__wait_time_is_too_short)
         )
@@ -115,7 +124,7 @@ class DeprovisionMinecraftServerStateMachine(Construct):
                 next=wait_and_then_destroy_server,
             )
             .otherwise(
-                submit_cdk_destroy_batch_job,
+                destroy_server_stack,
             )
         )
 
@@ -126,43 +135,141 @@ class DeprovisionMinecraftServerStateMachine(Construct):
             role=None,
         )
 
-    def create__destroy__submit_batch_job_state(
-        self, state_machine_arn: str, job_queue_arn: str
-    ) -> sfn_tasks.BatchSubmitJob:
-        return create__destroy__submit_batch_job_state(
-            scope=self,
-            id_prefix=self.node.id if self.ensure_unique_id_names else "",
-            job_queue_arn=job_queue_arn,
-            destroy_mc_server_job_definition_arn=state_machine_arn,
-        )
 
-
-def create__destroy__submit_batch_job_state(
+def create__destroy_server_stack__states(
     scope: Construct,
     id_prefix: str,
-    job_queue_arn: str,
-    destroy_mc_server_job_definition_arn: str,
-) -> sfn_tasks.BatchSubmitJob:
-    """Create the AWS Step Function State that submits the AWS Batch Job to deploy the Minecraft server.
+    server_stack_name: str,
+) -> sfn.IChainable:
+    """Create the AWS Step Function States that delete the Minecraft server's CloudFormation stack.
+
+    The stack is deleted with the Step Functions SDK integration for CloudFormation, which then
+    polls the stack until the deletion has finished, so the execution only succeeds once the
+    server is actually gone and fails if the deletion fails. The stack is polled by its ID rather
+    than its name because a deleted stack can still be described by ID (as ``DELETE_COMPLETE``).
 
     :param scope: The scope of the construct.
-    :param id_prefix: The prefix to use for the ID of the construct.
-    :param job_queue_arn: The ARN of the AWS Batch Job Queue to submit the job to.
-    :param deploy_mc_server_job_definition_arn: The ARN of the AWS Batch Job Definition to use for the job.
+    :param id_prefix: The prefix to use for the IDs of the states.
+    :param server_stack_name: The name of the CloudFormation stack of the Minecraft server.
 
-    :return: The AWS Step Function State that submits the AWS Batch Job to deploy the Minecraft server.
+    :return: The first state of the chain; every path ends in a Succeed or Fail state.
     """
-    return sfn_tasks.BatchSubmitJob(
-        scope=scope,
+    server_stack_arn: str = Stack.of(scope).format_arn(
+        service="cloudformation", resource="stack", resource_name=f"{server_stack_name}/*"
+    )
+
+    server_already_destroyed = sfn.Succeed(scope, id=f"{id_prefix}Server already destroyed")
+    server_destroyed = sfn.Succeed(scope, id=f"{id_prefix}Server destroyed")
+    failure__stack_deletion_failed = sfn.Fail(
+        scope,
+        id=f"{id_prefix}Fail: server stack deletion failed",
+        cause=f"The CloudFormation stack {server_stack_name} could not be deleted.",
+    )
+    failure__stack_lookup_failed = sfn.Fail(
+        scope,
+        id=f"{id_prefix}Fail: server stack lookup failed",
+        cause=f"The CloudFormation stack {server_stack_name} could not be described.",
+    )
+
+    # DescribeStacks fails for a stack name that does not exist, i.e. the server is not running;
+    # any other error (e.g. AccessDenied) must fail the execution rather than report the server as gone
+    does_server_stack_exist = (
+        sfn.Choice(scope, id=f"{id_prefix}Does server stack exist?")
+        .when(
+            sfn.Condition.string_matches("$.server_stack_error.Cause", "*does not exist*"),
+            server_already_destroyed,
+        )
+        .otherwise(failure__stack_lookup_failed)
+    )
+
+    get_server_stack_id = sfn_tasks.CallAwsService(
+        scope,
+        id=f"{id_prefix}Get server stack ID",
+        service="cloudformation",
+        action="describeStacks",
+        parameters={"StackName": server_stack_name},
+        iam_resources=[server_stack_arn],
+        result_selector={"StackId.$": "$.Stacks[0].StackId"},
+        result_path="$.server_stack",
+    )
+    # few attempts: a stack that does not exist raises the same error as throttling and is retried too
+    retry_cloudformation_call_on_throttling(get_server_stack_id, max_attempts=3)
+    get_server_stack_id.add_catch(
+        does_server_stack_exist, errors=[CLOUDFORMATION_SDK_ERROR], result_path="$.server_stack_error"
+    )
+
+    delete_server_stack = sfn_tasks.CallAwsService(
+        scope,
         id=f"{id_prefix}Destroy Server",
-        job_name=f"{id_prefix}DestroyMinecraftServer",
-        container_overrides=sfn_tasks.BatchContainerOverrides(
-            environment=None,
-            command=["cdk", "destroy", "--app", "'python3 /app/app.py'", "--force"],
-        ),
-        job_queue_arn=job_queue_arn,
-        job_definition_arn=destroy_mc_server_job_definition_arn,
+        service="cloudformation",
+        action="deleteStack",
+        parameters={"StackName": sfn.JsonPath.string_at("$.server_stack.StackId")},
+        iam_resources=[server_stack_arn],
+        result_path=sfn.JsonPath.DISCARD,
+    )
+    retry_cloudformation_call_on_throttling(delete_server_stack)
+
+    wait_for_stack_deletion = sfn.Wait(
+        scope,
+        id=f"{id_prefix}Wait for server stack deletion",
+        time=sfn.WaitTime.duration(STACK_DELETION_POLL_INTERVAL),
+    )
+
+    get_server_stack_status = sfn_tasks.CallAwsService(
+        scope,
+        id=f"{id_prefix}Get server stack status",
+        service="cloudformation",
+        action="describeStacks",
+        parameters={"StackName": sfn.JsonPath.string_at("$.server_stack.StackId")},
+        iam_resources=[server_stack_arn],
+        result_selector={
+            "StackId.$": "$.Stacks[0].StackId",
+            "StackStatus.$": "$.Stacks[0].StackStatus",
+        },
+        result_path="$.server_stack",
+    )
+    retry_cloudformation_call_on_throttling(get_server_stack_status)
+
+    is_stack_deleted = (
+        sfn.Choice(scope, id=f"{id_prefix}Is server stack deleted?")
+        .when(
+            sfn.Condition.string_equals("$.server_stack.StackStatus", "DELETE_COMPLETE"),
+            server_destroyed,
+        )
+        .when(
+            sfn.Condition.string_equals("$.server_stack.StackStatus", "DELETE_FAILED"),
+            failure__stack_deletion_failed,
+        )
+        .otherwise(wait_for_stack_deletion)
+    )
+
+    return get_server_stack_id.next(
+        delete_server_stack.next(wait_for_stack_deletion.next(get_server_stack_status.next(is_stack_deleted)))
+    )
+
+
+def retry_cloudformation_call_on_throttling(
+    call_aws_service_task: sfn_tasks.CallAwsService,
+    max_attempts: int = 6,
+) -> sfn_tasks.CallAwsService:
+    """
+    Retry a CloudFormation SDK call with exponential backoff when CloudFormation throttles it.
+
+    The SDK integration reports throttling as the generic ``CLOUDFORMATION_SDK_ERROR``, so any
+    other error with that name is retried as well before it reaches the task's catchers.
+
+    :param call_aws_service_task: The state that calls the CloudFormation API.
+    :param max_attempts: The number of times to retry the call.
+
+    :return: The same state, so that calls can be chained.
+    """
+    call_aws_service_task.add_retry(
+        errors=[CLOUDFORMATION_SDK_ERROR],
+        interval=Duration.seconds(2),
+        backoff_rate=2.0,
+        max_attempts=max_attempts,
     )
+    return call_aws_service_task
 
 
 # def create__validate_input__state(scope: Construct, id_prefix: str) -> sfn_tasks.LambdaInvoke:
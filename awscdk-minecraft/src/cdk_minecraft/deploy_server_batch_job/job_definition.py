@@ -1,6 +1,6 @@
 """Job definition for the batch job that will deploy the Minecraft server on EC2."""
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import aws_cdk as cdk
 from aws_cdk import Stack
@@ -13,6 +13,80 @@ from cdk_minecraft.constants import AWSCDK_MINECRAFT_SERVER_DEPLOYER__DIR
 from cdk_minecraft.deploy_server_batch_job.server_backup_docker_image import MinecraftServerBackupServiceImage
 from constructs import Construct
 
+# actions granted to the batch execution role, built once at import time; de-duplicated and
+# sorted so that the synthesized policy stays stable no matter how this list is edited.
+# Everything after the ECR image-pull actions comes from the AWS docs for batch service roles.
+_BATCH_EXECUTION_ACTIONS: Tuple[str, ...] = tuple(
+    sorted(
+        {
+            "ecr:GetAuthorizationToken",
+            "ecr:BatchCheckLayerAvailability",
+            "ecr:GetDownloadUrlForLayer",
+            "ecr:BatchGetImage",
+            "ec2:DescribeAccountAttributes",
+            "ec2:DescribeInstances",
+            "ec2:DescribeInstanceAttribute",
+            "ec2:DescribeSubnets",
+            "ec2:DescribeSecurityGroups",
+            "ec2:DescribeKeyPairs",
+            "ec2:DescribeImages",
+            "ec2:DescribeImageAttribute",
+            "ec2:DescribeInstanceStatus",
+            "ec2:DescribeSpotInstanceRequests",
+            "ec2:DescribeSpotFleetInstances",
+            "ec2:DescribeSpotFleetRequests",
+            "ec2:DescribeSpotPriceHistory",
+            "ec2:DescribeVpcClassicLink",
+            "ec2:DescribeLaunchTemplateVersions",
+            "ec2:CreateLaunchTemplate",
+            "ec2:DeleteLaunchTemplate",
+            "ec2:RequestSpotFleet",
+            "ec2:CancelSpotFleetRequests",
+            "ec2:ModifySpotFleetRequest",
+            "ec2:TerminateInstances",
+            "ec2:RunInstances",
+            "autoscaling:DescribeAccountLimits",
+            "autoscaling:DescribeAutoScalingGroups",
+            "autoscaling:DescribeLaunchConfigurations",
+            "autoscaling:DescribeAutoScalingInstances",
+            "autoscaling:CreateLaunchConfiguration",
+            "autoscaling:CreateAutoScalingGroup",
+            "autoscaling:UpdateAutoScalingGroup",
+            "autoscaling:SetDesiredCapacity",
+            "autoscaling:DeleteLaunchConfiguration",
+            "autoscaling:DeleteAutoScalingGroup",
+            "autoscaling:CreateOrUpdateTags",
+            "autoscaling:SuspendProcesses",
+            "autoscaling:PutNotificationConfiguration",
+            "autoscaling:TerminateInstanceInAutoScalingGroup",
+            "ecs:DescribeClusters",
+            "ecs:DescribeContainerInstances",
+            "ecs:DescribeTaskDefinition",
+            "ecs:DescribeTasks",
+            "ecs:ListAccountSettings",
+            "ecs:ListClusters",
+            "ecs:ListContainerInstances",
+            "ecs:ListTaskDefinitionFamilies",
+            "ecs:ListTaskDefinitions",
+            "ecs:ListTasks",
+            "ecs:CreateCluster",
+            "ecs:DeleteCluster",
+            "ecs:RegisterTaskDefinition",
+            "ecs:DeregisterTaskDefinition",
+            "ecs:RunTask",
+            "ecs:StartTask",
+            "ecs:StopTask",
+            "ecs:UpdateContainerAgent",
+            "ecs:DeregisterContainerInstance",
+            "logs:CreateLogGroup",
+            "logs:CreateLogStream",
+            "logs:PutLogEvents",
+            "logs:DescribeLogGroups",
+            "iam:GetInstanceProfile",
+            "iam:GetRole",
+        }
+    )
+)
 
 def make_minecraft_ec2_deployment__batch_job_definition(
     scope: Construct,
@@ -22,6 +96,8 @@ def make_minecraft_ec2_deployment__batch_job_definition(
     top_level_custom_domain_name: Optional[str] = None,
     minecraft_server_version: Optional[str] = None,
     ec2_instance_type: Optional[str] = "t2.medium",
+    ec2_machine_image_id: Optional[str] = None,
+    log_group: Optional[logs.ILogGroup] = None,
 ) -> batch.EcsJobDefinition:
     """Create a batch job definition to deploy a Minecraft server on EC2.
 
@@ -32,6 +108,12 @@ def make_minecraft_ec2_deployment__batch_job_definition(
     id_prefix : str
         The prefix to use for the id of the job definition.
         The id will be of the form f"{id_prefix}JobDefinition".
+    ec2_machine_image_id : Optional[str]
+        The ID of an AMI with the server's dependencies pre-installed; see
+        ``awscdk-minecraft-server-deployer/resources/minecraft-server/install-dependencies.sh``.
+    log_group : Optional[logs.ILogGroup]
+        A log group to send the job's logs to, e.g. one shared with other job definitions.
+        If not given, a log group is created for this job definition.
 
     Returns
     -------
@@ -43,24 +125,30 @@ def make_minecraft_ec2_deployment__batch_job_definition(
 
     stack = Stack.of(scope)
 
+    # This has to be created eagerly: constructs cannot be added once synthesis has started, so it
+    # cannot hide behind a cdk.Lazy value. Synth only stages the (small, .dockerignore'd) build
+    # context; the docker build itself is deferred to asset publishing during ``cdk deploy``.
     backup_service_image = MinecraftServerBackupServiceImage(
         scope=scope, id=f"{id_prefix}MinecraftServerBackupServiceImage", ensure_unique_ids=True
     )
 
-    env_vars = {
-        "AWS_ACCOUNT_ID": stack.account,
-        "AWS_REGION": stack.region,
-        "BACKUP_SERVICE_ECR_REPO_ARN": backup_service_image.ecr_repo_arn,
-        "BACKUP_SERVICE_DOCKER_IMAGE_URI": backup_service_image.image_uri,
-        "MINECRAFT_SERVER_BACKUPS_BUCKET_NAME": backups_bucket_name,
-        "EC2_INSTANCE_TYPE": ec2_instance_type,
+    # unset options are left out so that the deployer app falls back to its own defaults
+    env_vars: Dict[str, str] = {
+        key: value
+        for key, value in {
+            "AWS_ACCOUNT_ID": stack.account,
+            "AWS_REGION": stack.region,
+            "BACKUP_SERVICE_ECR_REPO_ARN": backup_service_image.ecr_repo_arn,
+            "BACKUP_SERVICE_DOCKER_IMAGE_URI": backup_service_image.image_uri,
+            "MINECRAFT_SERVER_BACKUPS_BUCKET_NAME": backups_bucket_name,
+            "EC2_INSTANCE_TYPE": ec2_instance_type,
+            "SSH_KEY_PAIR_NAME": ssh_key_pair_name,
+            "CUSTOM_TOP_LEVEL_DOMAIN_NAME": top_level_custom_domain_name,
+            "MINECRAFT_SERVER_VERSION": minecraft_server_version,
+            "EC2_MACHINE_IMAGE_ID": ec2_machine_image_id,
+        }.items()
+        if value is not None
     }
-    if ssh_key_pair_name:
-        env_vars["SSH_KEY_PAIR_NAME"] = ssh_key_pair_name
-    if top_level_custom_domain_name:
-        env_vars["CUSTOM_TOP_LEVEL_DOMAIN_NAME"] = top_level_custom_domain_name
-    if minecraft_server_version:
-        env_vars["MINECRAFT_SERVER_VERSION"] = minecraft_server_version
 
     return batch.EcsJobDefinition(
         scope=scope,
@@ -71,14 +159,17 @@ def make_minecraft_ec2_deployment__batch_job_definition(
             image=ecs.ContainerImage.from_asset(
                 directory=str(AWSCDK_MINECRAFT_SERVER_DEPLOYER__DIR),
                 platform=ecr_assets.Platform.LINUX_AMD64,
+                asset_hash_type=cdk.AssetHashType.SOURCE,
             ),
             command=["cdk", "deploy", "--app", "'python3 /app/app.py'", "--require-approval=never"],
             job_role=job_role,
             execution_role=execution_role,
             logging=ecs.LogDriver.aws_logs(
-                log_group=logs.LogGroup(
+                log_group=log_group
+                or logs.LogGroup(
                     scope=scope,
                     id=f"{id_prefix}CdkMinecraftEc2DeploymentLogGroup",
+                    retention=logs.RetentionDays.ONE_MONTH,
                 ),
                 stream_prefix=id_prefix,
             ),
@@ -93,135 +184,96 @@ def make_minecraft_ec2_deployment__batch_job_definition(
 def make_cdk_deployment_role(scope: Construct, id_prefix: str) -> iam.Role:
     """Grant batch job privileges to run CDK commands to handle resources.
 
+    The CDK CLI deploys, publishes assets and performs context lookups by assuming the roles
+    created by ``cdk bootstrap``; CloudFormation then creates the server's resources with the
+    bootstrap's execution role. So this role only needs to assume those roles and read the
+    bootstrap version.
+
+    Calling this again with the same ``scope`` and ``id_prefix`` returns the role created by the
+    first call, so callers sharing a role must not modify it.
+
     Parameters
     ----------
     scope : Construct
         The scope of the stack.
     id_prefix : str
         The prefix to use for the id of the role.
-        The id will be of the form f"{id_prefix}CdkDeploymentRole".
+        The id will be of the form f"{id_prefix}CdkDeployRole".
 
     Returns
     -------
     iam.Role
         The role granting the necessary privileges for CDK commands.
     """
+    existing_role: Optional[iam.Role] = scope.node.try_find_child(f"{id_prefix}CdkDeployRole")
+    if existing_role is not None:
+        return existing_role
+
+    stack = Stack.of(scope)
+    partition, region, account = stack.partition, stack.region, stack.account
+
     return iam.Role(
         scope=scope,
         id=f"{id_prefix}CdkDeployRole",
         assumed_by=iam.ServicePrincipal(service="ecs-tasks.amazonaws.com"),
-        managed_policies=[iam.ManagedPolicy.from_aws_managed_policy_name("AdministratorAccess")],
+        inline_policies={
+            "CdkDeploy": iam.PolicyDocument(
+                statements=[
+                    # the deploy, file/image publishing and lookup roles from ``cdk bootstrap``
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=["sts:AssumeRole"],
+                        resources=[f"arn:{partition}:iam::{account}:role/cdk-*"],
+                    ),
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=["ssm:GetParameter"],
+                        resources=[f"arn:{partition}:ssm:{region}:{account}:parameter/cdk-bootstrap/*"],
+                    ),
+                ]
+            )
+        },
     )
 
 
 def make_batch_execution_role(scope: Construct, id_prefix: str) -> iam.Role:
     """Create a role that can be assumed by the batch job to execute the CDK commands.
 
+    Calling this again with the same ``scope`` and ``id_prefix`` returns the role created by the
+    first call, so callers sharing a role must not modify it.
+
     Parameters
     ----------
     scope : Construct
         The scope of the stack.
     id_prefix : str
         The prefix to use for the id of the role.
-        The id will be of the form f"{id_prefix}BatchExecutionRole".
+        The id will be of the form f"{id_prefix}BatchRole".
 
     Returns
     -------
     iam.Role
         The role granting the necessary privileges for CDK commands.
     """
-    role = iam.Role(
+    existing_role: Optional[iam.Role] = scope.node.try_find_child(f"{id_prefix}BatchRole")
+    if existing_role is not None:
+        return existing_role
+
+    # the policy is passed to the role's constructor rather than attached as a separate
+    # iam.Policy so the whole role crosses the jsii bridge in one call
+    return iam.Role(
         scope=scope,
         id=f"{id_prefix}BatchRole",
         assumed_by=iam.ServicePrincipal(service="ecs-tasks.amazonaws.com"),
+        inline_policies={
+            "EcsPolicy": iam.PolicyDocument(
+                statements=[
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=list(_BATCH_EXECUTION_ACTIONS),
+                        resources=["*"],
+                    )
+                ],
+            )
+        },
     )
-
-    role.attach_inline_policy(
-        policy=iam.Policy(
-            scope=scope,
-            id=f"{id_prefix}EcsPolicy",
-            document=iam.PolicyDocument.from_json(
-                {
-                    "Version": "2012-10-17",
-                    "Statement": [
-                        {
-                            "Effect": "Allow",
-                            "Action": [
-                                "ecr:GetAuthorizationToken",
-                                "ecr:BatchCheckLayerAvailability",
-                                "ecr:GetDownloadUrlForLayer",
-                                "ecr:BatchGetImage",
-                                # "logs:CreateLogStream",
-                                # "logs:PutLogEvents",
-                                # from AWS docs
-                                "ec2:DescribeAccountAttributes",
-                                "ec2:DescribeInstances",
-                                "ec2:DescribeInstanceAttribute",
-                                "ec2:DescribeSubnets",
-                                "ec2:DescribeSecurityGroups",
-                                "ec2:DescribeKeyPairs",
-                                "ec2:DescribeImages",
-                                "ec2:DescribeImageAttribute",
-                                "ec2:DescribeInstanceStatus",
-                                "ec2:DescribeSpotInstanceRequests",
-                                "ec2:DescribeSpotFleetInstances",
-                                "ec2:DescribeSpotFleetRequests",
-                                "ec2:DescribeSpotPriceHistory",
-                                "ec2:DescribeVpcClassicLink",
-                                "ec2:DescribeLaunchTemplateVersions",
-                                "ec2:CreateLaunchTemplate",
-                                "ec2:DeleteLaunchTemplate",
-                                "ec2:RequestSpotFleet",
-                                "ec2:CancelSpotFleetRequests",
-                                "ec2:ModifySpotFleetRequest",
-                                "ec2:TerminateInstances",
-                                "ec2:RunInstances",
-                                "autoscaling:DescribeAccountLimits",
-                                "autoscaling:DescribeAutoScalingGroups",
-                                "autoscaling:DescribeLaunchConfigurations",
-                                "autoscaling:DescribeAutoScalingInstances",
-                                "autoscaling:CreateLaunchConfiguration",
-                                "autoscaling:CreateAutoScalingGroup",
-                                "autoscaling:UpdateAutoScalingGroup",
-                                "autoscaling:SetDesiredCapacity",
-                                "autoscaling:DeleteLaunchConfiguration",
-                                "autoscaling:DeleteAutoScalingGroup",
-                                "autoscaling:CreateOrUpdateTags",
-                                "autoscaling:SuspendProcesses",
-                                "autoscaling:PutNotificationConfiguration",
-                                "autoscaling:TerminateInstanceInAutoScalingGroup",
-                                "ecs:DescribeClusters",
-                                "ecs:DescribeContainerInstances",
-                                "ecs:DescribeTaskDefinition",
-                                "ecs:DescribeTasks",
-                                "ecs:ListAccountSettings",
-                                "ecs:ListClusters",
-                                "ecs:ListContainerInstances",
-                                "ecs:ListTaskDefinitionFamilies",
-                                "ecs:ListTaskDefinitions",
-                                "ecs:ListTasks",
-                                "ecs:CreateCluster",
-                                "ecs:DeleteCluster",
-                                "ecs:RegisterTaskDefinition",
-                                "ecs:DeregisterTaskDefinition",
-                                "ecs:RunTask",
-                                "ecs:StartTask",
-                                "ecs:StopTask",
-                                "ecs:UpdateContainerAgent",
-                                "ecs:DeregisterContainerInstance",
-                                "logs:CreateLogGroup",
-                                "logs:CreateLogStream",
-                                "logs:PutLogEvents",
-                                "logs:DescribeLogGroups",
-                                "iam:GetInstanceProfile",
-                                "iam:GetRole",
-                            ],
-                            "Resource": "*",
-                        }
-                    ],
-                }
-            ),
-        )
-    )
-
-    return role
@@ -1,10 +1,16 @@
 """Boilerplate stack to make sure the CDK is set up correctly."""
 from typing import List, Optional
 
+from aws_cdk import Duration
 from aws_cdk import aws_batch as batch
 from aws_cdk import aws_ec2 as ec2
+from aws_cdk import aws_stepfunctions_tasks as sfn_tasks
 from constructs import Construct
 
+#: errors raised by the Step Functions Batch integration when the SubmitJob quota (50 TPS) is exceeded;
+#: the ``.sync`` integration reports throttling as the generic ``Batch.AWSBatchException``
+BATCH_THROTTLING_ERRORS = ["Batch.TooManyRequestsException", "Batch.AWSBatchException"]
+
 
 class BatchJobQueue(Construct):
     """Class to create a batch job queue.
@@ -125,3 +131,30 @@ def make_batch_job_queue(
         ],
         priority=priority,
     )
+
+
+def retry_submit_job_on_throttling(
+    submit_job_task: sfn_tasks.BatchSubmitJob,
+    max_attempts: int = 6,
+) -> sfn_tasks.BatchSubmitJob:
+    """Retry a batch job submission with exponential backoff when AWS Batch throttles it.
+
+    Parameters
+    ----------
+    submit_job_task : sfn_tasks.BatchSubmitJob
+        The state that submits the job.
+    max_attempts : int, optional
+        The number of times to retry the submission, by default 6
+
+    Returns
+    -------
+    sfn_tasks.BatchSubmitJob
+        The same state, so that calls can be chained.
+    """
+    submit_job_task.add_retry(
+        errors=BATCH_THROTTLING_ERRORS,
+        interval=Duration.seconds(2),
+        backoff_rate=2.0,
+        max_attempts=max_attempts,
+    )
+    return submit_job_task
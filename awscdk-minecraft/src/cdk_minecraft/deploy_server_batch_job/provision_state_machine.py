@@ -5,6 +5,7 @@ from pathlib import Path
 from aws_cdk import aws_lambda as lambda_
 from aws_cdk import aws_stepfunctions as sfn
 from aws_cdk import aws_stepfunctions_tasks as sfn_tasks
+from cdk_minecraft.deploy_server_batch_job.job_queue import retry_submit_job_on_throttling
 from cdk_minecraft.deploy_server_batch_job.state_machine_input_validator.state_machine_input_validator_lambda import (
     make_lambda_that_validates_input_of_the_provision_server_state_machine,
 )
@@ -106,7 +107,7 @@ def create__deploy__submit_batch_job_state(
 
     :return: The AWS Step Function State that submits the AWS Batch Job to deploy the Minecraft server.
     """
-    return sfn_tasks.BatchSubmitJob(
+    submit_job = sfn_tasks.BatchSubmitJob(
         scope=scope,
         id=f"Deploy Server {id_prefix}".strip(),
         job_name=f"{id_prefix}DeployMinecraftServer",
@@ -117,3 +118,4 @@ def create__deploy__submit_batch_job_state(
         job_queue_arn=job_queue_arn,
         job_definition_arn=deploy_mc_server_job_definition_arn,
     )
+    return retry_submit_job_on_throttling(submit_job)
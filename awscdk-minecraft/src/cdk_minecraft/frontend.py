@@ -4,6 +4,7 @@ import hashlib
 import json
 from typing import Optional
 
+import aws_cdk as cdk
 from aws_cdk import aws_certificatemanager as acm
 from aws_cdk import aws_cloudfront as cloudfront
 from aws_cdk import aws_cloudfront_origins as cloudfront_origins
@@ -70,12 +71,22 @@ def make_minecraft_platform_frontend_static_website(
     id_prefix: str,
     top_level_hosted_zone: route53.IHostedZone,
     tls_cert: Optional[acm.ICertificate] = None,
+    dev_mode: bool = False,
 ) -> StaticWebsite:
-    """Deploy the static minecraft platform frontend web files to a S3/CloudFront static site."""
+    """Deploy the static minecraft platform frontend web files to a S3/CloudFront static site.
+
+    In ``dev_mode`` the website bucket and its contents are deleted along with the stack.
+    """
     optional_kwargs = {}
-    if None not in [top_level_hosted_zone, tls_cert]:
-        website_bucket = s3.Bucket(scope, id=f"{id_prefix}WebsiteBucket")
+    if dev_mode or None not in [top_level_hosted_zone, tls_cert]:
+        website_bucket = s3.Bucket(
+            scope,
+            id=f"{id_prefix}WebsiteBucket",
+            removal_policy=cdk.RemovalPolicy.DESTROY if dev_mode else None,
+            auto_delete_objects=dev_mode,
+        )
         optional_kwargs["website_bucket"] = website_bucket
+    if None not in [top_level_hosted_zone, tls_cert]:
         optional_kwargs["distribution_props"] = cloudfront.DistributionProps(
             default_behavior=cloudfront.BehaviorOptions(
                 origin=cloudfront_origins.S3Origin(website_bucket),
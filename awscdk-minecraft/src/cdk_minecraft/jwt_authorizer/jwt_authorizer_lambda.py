@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import aws_cdk as cdk
+from aws_cdk import aws_lambda as lambda_
+from aws_cdk import aws_lambda_python_alpha as lambda_python
+from constructs import Construct
+
+THIS_DIR = Path(__file__).parent
+JWT_AUTHORIZER__SRC_DIR = THIS_DIR / "resources"
+
+
+def make_jwt_authorizer_lambda(
+    scope: Construct, id_prefix: str, user_pool_id: str, user_pool_client_id: str
+) -> lambda_python.PythonFunction:
+    """Create a lambda function that verifies Cognito ID tokens issued to the given user pool client."""
+    return lambda_python.PythonFunction(
+        scope,
+        f"{id_prefix}JwtAuthorizer",
+        entry=str(JWT_AUTHORIZER__SRC_DIR),
+        handler="handler",
+        index="index.py",
+        runtime=lambda_.Runtime.PYTHON_3_8,
+        timeout=cdk.Duration.seconds(10),
+        memory_size=512,
+        environment={
+            "USER_POOL_ID": user_pool_id,
+            "USER_POOL_CLIENT_ID": user_pool_client_id,
+        },
+        bundling=lambda_python.BundlingOptions(build_args={"platform": "linux/amd64"}),
+    )
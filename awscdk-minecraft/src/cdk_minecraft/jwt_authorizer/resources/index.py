@@ -0,0 +1,88 @@
+"""
+API Gateway token authorizer that verifies Cognito ID tokens without calling Cognito.
+
+The user pool's public signing keys are downloaded once per Lambda container, when this
+module is imported, so each invocation only verifies the token's RS256 signature and claims.
+"""
+
+import json
+import os
+from typing import Dict, Optional
+from urllib.request import urlopen
+
+from jose import jwt
+from jose.exceptions import JOSEError
+
+AWS_REGION = os.environ["AWS_REGION"]
+USER_POOL_ID = os.environ["USER_POOL_ID"]
+USER_POOL_CLIENT_ID = os.environ["USER_POOL_CLIENT_ID"]
+
+ISSUER = f"https://cognito-idp.{AWS_REGION}.amazonaws.com/{USER_POOL_ID}"
+
+# fail the cold start quickly instead of hanging until the Lambda init phase times out
+JWKS_DOWNLOAD_TIMEOUT_SECONDS = 5
+
+with urlopen(f"{ISSUER}/.well-known/jwks.json", timeout=JWKS_DOWNLOAD_TIMEOUT_SECONDS) as response:
+    JWKS: Dict = json.loads(response.read())
+
+
+def handler(event: Dict[str, str], context) -> Dict:
+    """Return an IAM policy allowing the request if ``event["authorizationToken"]`` is a valid ID token."""
+    claims: Optional[Dict] = verify_id_token(token=event["authorizationToken"])
+    if claims is None:
+        # API Gateway responds with 401 Unauthorized when the authorizer raises this exact message
+        raise Exception("Unauthorized")
+
+    return {
+        "principalId": claims["sub"],
+        "policyDocument": {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Action": "execute-api:Invoke",
+                    "Effect": "Allow",
+                    "Resource": make_api_wildcard_arn(method_arn=event["methodArn"]),
+                }
+            ],
+        },
+        "context": {"email": claims.get("email", "")},
+    }
+
+
+def verify_id_token(token: str) -> Optional[Dict]:
+    """Return the claims of ``token`` if it is an unexpired ID token for the web client; otherwise None."""
+    if token.lower().startswith("bearer "):
+        token = token[len("bearer ") :]
+
+    try:
+        claims: Dict = jwt.decode(
+            token,
+            JWKS,
+            algorithms=["RS256"],
+            audience=USER_POOL_CLIENT_ID,
+            issuer=ISSUER,
+            options={"verify_at_hash": False},
+        )
+    except JOSEError as err:
+        print(f"Rejecting token: {err}")
+        return None
+
+    if claims.get("token_use") != "id":
+        print(f"Rejecting token with token_use {claims.get('token_use')}")
+        return None
+
+    return claims
+
+
+def make_api_wildcard_arn(method_arn: str) -> str:
+    """
+    Widen ``method_arn`` to every method and resource of the same API stage.
+
+    API Gateway caches the returned policy per token, so a policy that only allowed the
+    method of the first request would deny the same user's other requests until the cache expires.
+
+    ``arn:aws:execute-api:<region>:<account>:<api id>/<stage>/<method>/<resource path>``
+    becomes ``arn:aws:execute-api:<region>:<account>:<api id>/<stage>/*``.
+    """
+    api_id_and_stage = "/".join(method_arn.split("/")[:2])
+    return f"{api_id_and_stage}/*"
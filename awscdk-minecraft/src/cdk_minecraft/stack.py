@@ -19,8 +19,14 @@ class MinecraftPaasStack(cdk.Stack):
         manually in the AWS console or via the AWS CLI in order to be referenced here. WARNING! This stack \
         will not validate that the keypair exists, so not setting it will mysteriously cause the deployments \
         from the Minecraft PaaS web UI to fail.
+    :param top_level_hosted_zone_id: Optionally pass the ID of the Route53 hosted zone for \
+        ``top_level_custom_domain_name`` so that it does not have to be looked up during synth.
+    :param ec2_machine_image_id: Optionally pass the ID of an AMI with docker, docker-compose and the AWS CLI \
+        pre-installed to launch the server from, so that the server does not install them on every boot.
     :param disable_frontend: Optionally disable the frontend for the Minecraft PaaS
     :param disable_auth: Optionally disable the authentication for the Minecraft PaaS
+    :param dev_mode: Delete the buckets (and their contents) and the user pool when the stack is destroyed \
+        instead of retaining them. Only use this for stacks whose data is disposable.
 
         ```bash
         # create a new keypair from ~/.ssh/id_rsa.pub
@@ -38,10 +44,13 @@ class MinecraftPaasStack(cdk.Stack):
         minecraft_data_bucket_name: Optional[str] = None,
         ssh_key_pair_name: Optional[str] = None,
         top_level_custom_domain_name: Optional[str] = None,
+        top_level_hosted_zone_id: Optional[str] = None,
         minecraft_server_version: Optional[str] = None,
         ec2_instance_type: Optional[str] = None,
+        ec2_machine_image_id: Optional[str] = None,
         disable_frontend: Optional[bool] = False,
         disable_auth: Optional[bool] = False,
+        dev_mode: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -53,8 +62,11 @@ class MinecraftPaasStack(cdk.Stack):
             minecraft_data_bucket_name=minecraft_data_bucket_name,
             ssh_key_pair_name=ssh_key_pair_name,
             top_level_custom_domain_name=top_level_custom_domain_name,
+            top_level_hosted_zone_id=top_level_hosted_zone_id,
             minecraft_server_version=minecraft_server_version,
             ec2_instance_type=ec2_instance_type,
+            ec2_machine_image_id=ec2_machine_image_id,
             disable_frontend=disable_frontend,
             disable_auth=disable_auth,
+            dev_mode=dev_mode,
         )
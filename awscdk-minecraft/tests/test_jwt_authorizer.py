@@ -0,0 +1,107 @@
+"""Unit tests for the JWT authorizer Lambda, using tokens signed with a locally generated key."""
+
+import importlib.util
+import io
+import json
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+AUTHORIZER_INDEX_FPATH = (
+    Path(__file__).parent.parent / "src" / "cdk_minecraft" / "jwt_authorizer" / "resources" / "index.py"
+)
+
+AWS_REGION = "us-west-2"
+USER_POOL_ID = "us-west-2_TestPool"
+USER_POOL_CLIENT_ID = "test-web-client-id"
+ISSUER = f"https://cognito-idp.{AWS_REGION}.amazonaws.com/{USER_POOL_ID}"
+KEY_ID = "test-key-id"
+
+
+@pytest.fixture(scope="module")
+def private_key_pem() -> bytes:  # noqa: D103
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+@pytest.fixture(scope="module")
+def jwks(private_key_pem: bytes) -> Dict:
+    """Return a JWKS document containing the public half of ``private_key_pem``."""
+    public_jwk: Dict = jwk.construct(private_key_pem, algorithm="RS256").public_key().to_dict()
+    return {"keys": [{**public_jwk, "kid": KEY_ID, "use": "sig"}]}
+
+
+@pytest.fixture
+def authorizer(monkeypatch: pytest.MonkeyPatch, jwks: Dict) -> ModuleType:
+    """Import the authorizer without network access and point its ``JWKS`` at the test key."""
+    monkeypatch.setenv("AWS_REGION", AWS_REGION)
+    monkeypatch.setenv("USER_POOL_ID", USER_POOL_ID)
+    monkeypatch.setenv("USER_POOL_CLIENT_ID", USER_POOL_CLIENT_ID)
+    monkeypatch.setattr(
+        "urllib.request.urlopen", lambda url, timeout: io.BytesIO(json.dumps({"keys": []}).encode())
+    )
+
+    spec = importlib.util.spec_from_file_location("jwt_authorizer_index", AUTHORIZER_INDEX_FPATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    monkeypatch.setattr(module, "JWKS", jwks)
+    return module
+
+
+def make_id_token(private_key_pem: bytes, **claim_overrides) -> str:
+    """Sign an ID token that the authorizer should accept unless ``claim_overrides`` break it."""
+    now = int(time.time())
+    claims = {
+        "sub": "test-user-sub",
+        "email": "test.user@minecraft-server-app.com",
+        "aud": USER_POOL_CLIENT_ID,
+        "iss": ISSUER,
+        "token_use": "id",
+        "iat": now,
+        "exp": now + 3600,
+        **claim_overrides,
+    }
+    return jwt.encode(claims, private_key_pem, algorithm="RS256", headers={"kid": KEY_ID})
+
+
+def test_verify_id_token__accepts_valid_token(authorizer, private_key_pem):  # noqa: D103
+    claims = authorizer.verify_id_token(token=make_id_token(private_key_pem))
+    assert claims["sub"] == "test-user-sub"
+
+
+def test_verify_id_token__accepts_bearer_prefix(authorizer, private_key_pem):  # noqa: D103
+    claims = authorizer.verify_id_token(token=f"Bearer {make_id_token(private_key_pem)}")
+    assert claims["sub"] == "test-user-sub"
+
+
+@pytest.mark.parametrize(
+    "claim_overrides",
+    [
+        {"aud": "some-other-client-id"},
+        {"iss": "https://cognito-idp.us-west-2.amazonaws.com/us-west-2_OtherPool"},
+        {"token_use": "access"},
+        {"iat": int(time.time()) - 7200, "exp": int(time.time()) - 3600},
+    ],
+    ids=["wrong-aud", "wrong-iss", "access-token", "expired"],
+)
+def test_verify_id_token__rejects_invalid_token(authorizer, private_key_pem, claim_overrides):  # noqa: D103
+    assert authorizer.verify_id_token(token=make_id_token(private_key_pem, **claim_overrides)) is None
+
+
+def test_make_api_wildcard_arn__nested_resource_path(authorizer):  # noqa: D103
+    method_arn = "arn:aws:execute-api:us-west-2:123456789012:abcdef1234/prod/GET/minecraft-server/status/latest"
+    assert (
+        authorizer.make_api_wildcard_arn(method_arn=method_arn)
+        == "arn:aws:execute-api:us-west-2:123456789012:abcdef1234/prod/*"
+    )
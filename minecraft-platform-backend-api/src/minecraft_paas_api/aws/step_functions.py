@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import json
+import time
 from datetime import datetime
 from functools import lru_cache
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import boto3
 
 try:
     from mypy_boto3_stepfunctions.client import SFNClient
+    from mypy_boto3_stepfunctions.literals import ExecutionStatusType
     from mypy_boto3_stepfunctions.type_defs import (
         DescribeExecutionOutputTypeDef,
         DescribeStateMachineOutputTypeDef,
@@ -19,6 +21,39 @@ try:
 except ImportError:
     print("Warning: boto3-stubs[stepfunctions] not installed")
 
+# orjson is installed with the [lambda] extra; fall back to the standard library elsewhere
+try:
+    import orjson
+
+    def _json_dumps(obj: Dict) -> str:
+        # the Step Functions API expects the execution input as a str, not bytes
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj: Dict) -> str:
+        # match orjson's compact output rather than json's default ", " and ": " separators
+        return json.dumps(obj, separators=(",", ":"))
+
+    _json_loads = json.loads
+
+# created on first use and reused for the life of the process (e.g. across warm lambda invocations)
+_SFN_CLIENT: Optional[SFNClient] = None
+
+
+def _get_client() -> "SFNClient":
+    """Return the shared Step Functions client, creating it on first use."""
+    global _SFN_CLIENT
+    if _SFN_CLIENT is None:
+        _SFN_CLIENT = boto3.client("stepfunctions")
+    return _SFN_CLIENT
+
+
+DESCRIBE_STATE_MACHINE_CACHE_TTL_SECONDS = 5 * 60
+# state machine ARN -> (time.monotonic() when described, response)
+_DESCRIBE_STATE_MACHINE_CACHE: Dict[str, Tuple[float, DescribeStateMachineOutputTypeDef]] = {}
+
 
 def trigger_state_machine(state_machine_arn: str, payload: Optional[Dict]) -> "StartExecutionOutputTypeDef":
     """Send command to state machine.
@@ -30,10 +65,10 @@ def trigger_state_machine(state_machine_arn: str, payload: Optional[Dict]) -> "S
     """
     if payload is None:
         payload = {}
-    sfn_client: SFNClient = boto3.client("stepfunctions")
+    sfn_client: SFNClient = _get_client()
     start_execuction_response: "StartExecutionOutputTypeDef" = sfn_client.start_execution(
         stateMachineArn=state_machine_arn,
-        input=json.dumps(payload),
+        input=_json_dumps(payload),
     )
     return start_execuction_response
 
@@ -42,34 +77,50 @@ def describe_state_machine(state_machine_arn: str) -> "DescribeStateMachineOutpu
     """
     Describe a state machine including its definition.
 
+    State machines only change when the stack is deployed, so responses are cached
+    for ``DESCRIBE_STATE_MACHINE_CACHE_TTL_SECONDS``.
+
     :param state_machine_arn: The ARN of the state machine to describe.
     """
-    sfn_client: "SFNClient" = boto3.client("stepfunctions")
+    cached: Optional[Tuple[float, "DescribeStateMachineOutputTypeDef"]] = _DESCRIBE_STATE_MACHINE_CACHE.get(
+        state_machine_arn
+    )
+    if cached is not None and time.monotonic() - cached[0] < DESCRIBE_STATE_MACHINE_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    sfn_client: "SFNClient" = _get_client()
     # TO DO: Add try except
     response: "DescribeStateMachineOutputTypeDef" = sfn_client.describe_state_machine(
         stateMachineArn=state_machine_arn
     )
+    _DESCRIBE_STATE_MACHINE_CACHE[state_machine_arn] = (time.monotonic(), response)
     return response
 
 
-def get_latest_statemachine_execution(state_machine_arn: str) -> Optional["ExecutionListItemTypeDef"]:
+def get_latest_statemachine_execution(
+    state_machine_arn: str, status: Optional["ExecutionStatusType"] = None
+) -> Optional["ExecutionListItemTypeDef"]:
     """
     Get the latest execution of a state machine.
 
     :param state_machine_arn: The ARN of the state machine to query.
+    :param status: If given, only consider executions with this status, e.g. ``"RUNNING"``.
     :return: The latest execution of the state machine, or None if there are no executions.
     """
-    sfn_client: "SFNClient" = boto3.client("stepfunctions")
+    sfn_client: "SFNClient" = _get_client()
     # TO DO: Add try except
-    response: ListExecutionsOutputTypeDef = sfn_client.list_executions(
-        stateMachineArn=state_machine_arn,
-        maxResults=10,
+    # executions are listed newest first, so the first item is the latest execution
+    list_executions_kwargs = {"stateMachineArn": state_machine_arn}
+    if status:
+        # filter server side so that the one result returned is the latest with this status
+        list_executions_kwargs["statusFilter"] = status
+    pages: Iterator[ListExecutionsOutputTypeDef] = sfn_client.get_paginator("list_executions").paginate(
+        **list_executions_kwargs, PaginationConfig={"MaxItems": 1, "PageSize": 1}
     )
-    executions: List["ExecutionListItemTypeDef"] = sorted(
-        response["executions"], key=lambda x: x["startDate"], reverse=True
-    )
-    latest_execution: "ExecutionListItemTypeDef" = executions[0] if len(executions) > 0 else None
-    return latest_execution
+    for page in pages:
+        executions: List["ExecutionListItemTypeDef"] = page["executions"]
+        return executions[0] if len(executions) > 0 else None
+    return None
 
 
 @lru_cache
@@ -80,7 +131,7 @@ def describe_state_machine_execution(execution_arn: str) -> "DescribeExecutionOu
     :param execution_arn: The ARN of the execution to query.
     :return: The input of the execution, or None if the execution does not exist.
     """
-    sfn_client: "SFNClient" = boto3.client("stepfunctions")
+    sfn_client: "SFNClient" = _get_client()
     # TO DO: Add try except
     response: "DescribeExecutionOutputTypeDef" = sfn_client.describe_execution(
         executionArn=execution_arn,
@@ -88,15 +139,19 @@ def describe_state_machine_execution(execution_arn: str) -> "DescribeExecutionOu
     return response
 
 
+@lru_cache(maxsize=256)
 def get_state_machine_execution_input(execution_arn: str) -> Dict:
     """
     Get the input of a state machine execution.
 
+    An execution's input never changes once it has started, so the parsed input is cached
+    per execution. The same dict is returned to every caller; do not modify it.
+
     :param execution_arn: The ARN of the execution to query.
     :return: The input of the execution, or None if the execution does not exist.
     """
     execution: "DescribeExecutionOutputTypeDef" = describe_state_machine_execution(execution_arn)
-    return json.loads(execution["input"])
+    return _json_loads(execution["input"])
 
 
 def get_state_machine_execution_start_timestamp(execution_arn: str) -> datetime: